@@ -0,0 +1,119 @@
+# ai/cache.py
+from typing import Dict, Any, List, Optional
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+from utils import fast_json
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """Cache of validated AI responses, keyed by an exact hash of the prompt.
+
+    Near-identical prompts are never matched: prompts are mostly shared
+    template text, so "attack goblin" and "attack orc" would otherwise be
+    answered with each other's responses. At most max_entries responses are
+    kept, least recently used first out. With a cache_path the entries also
+    persist between sessions; the file is compacted back to max_entries once
+    it holds twice that many lines.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None, max_entries: int = 512):
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._prompt_types: Dict[str, str] = {}
+        self._lines_on_disk = 0
+        # File writes run on a thread; this keeps them in order
+        self._write_lock = asyncio.Lock()
+
+        if cache_path is not None:
+            self._load()
+
+    @staticmethod
+    def _key(prompt_type: str, prompt: str) -> str:
+        return hashlib.blake2b(f"{prompt_type}\x1f{prompt}".encode()).hexdigest()
+
+    def get(self, prompt_type: str, prompt: str) -> Optional[Dict[str, Any]]:
+        """Return a cached response for the prompt, if any"""
+        key = self._key(prompt_type, prompt)
+        response = self._entries.get(key)
+        if response is None:
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(response)
+
+    async def put(self, prompt_type: str, prompt: str, response: Dict[str, Any]) -> None:
+        """Store a response for the prompt"""
+        key = self._key(prompt_type, prompt)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+
+        response = copy.deepcopy(response)
+        self._add(key, prompt_type, response)
+        if self.cache_path is None:
+            return
+
+        try:
+            line = self._line(key, prompt_type, response)
+            async with self._write_lock:
+                if self._lines_on_disk >= 2 * self.max_entries:
+                    lines = [self._line(k, self._prompt_types[k], v) for k, v in self._entries.items()]
+                    await asyncio.to_thread(self._rewrite, lines)
+                    self._lines_on_disk = len(lines)
+                else:
+                    await asyncio.to_thread(self._append, line)
+                    self._lines_on_disk += 1
+        except (OSError, TypeError) as e:
+            logger.error("Error persisting AI response cache: %s", e)
+
+    def _add(self, key: str, prompt_type: str, response: Dict[str, Any]) -> None:
+        self._entries[key] = response
+        self._prompt_types[key] = prompt_type
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            del self._prompt_types[evicted]
+
+    @staticmethod
+    def _line(key: str, prompt_type: str, response: Dict[str, Any]) -> str:
+        return json.dumps({'key': key, 'prompt_type': prompt_type, 'response': response}) + "\n"
+
+    def _append(self, line: str) -> None:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, 'a') as f:
+            f.write(line)
+
+    def _rewrite(self, lines: List[str]) -> None:
+        """Replace the cache file with only the entries still held in memory"""
+        temp_path = self.cache_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            f.writelines(lines)
+        os.replace(temp_path, self.cache_path)
+
+    def _load(self) -> None:
+        """Load persisted cache entries"""
+        if not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = fast_json.loads(line)
+                    self._add(entry['key'], entry['prompt_type'], entry['response'])
+                    self._lines_on_disk += 1
+        except (OSError, ValueError, KeyError) as e:
+            logger.error("Error loading AI response cache: %s", e)
+
+    def clear(self) -> None:
+        """Drop all in-memory entries"""
+        self._entries.clear()
+        self._prompt_types.clear()
@@ -1,195 +1,397 @@
 # ai/generator.py
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Deque, Final, List, Mapping, Optional, Tuple
+from types import MappingProxyType
+import copy
 import json
 import asyncio
 import logging
+import time
+from collections import deque
 from datetime import datetime
+from pathlib import Path
 from contextlib import asynccontextmanager
 
+from ai.cache import ResponseCache
 from prompts.prompts import PromptManager
 from utils.dice import DiceRoller
+from utils import fast_json
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, APIConnectionError, InternalServerError, RateLimitError
 from config.api_config import setup_api
 
-class AIGenerator:
+# Logging is configured once by the application (see config.settings)
+logger = logging.getLogger(__name__)
+
+# Connection pool shared by every request made through one generator
+HTTP_LIMITS: Final = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+HTTP_TIMEOUT: Final = 30.0
+
+# Transient API errors worth retrying with backoff
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+# Response tables are built once at import and are read-only; every response
+# handed out is a copy so callers can freely mutate it.
+
+# Fields filled in when a response leaves them out
+_RESPONSE_DEFAULTS: Final[Mapping[str, Mapping[str, Any]]] = MappingProxyType({
+    'location_description': {
+        'name': 'Unknown Area',
+        'description': 'A nondescript area stretches before you.',
+        'theme': 'generic',
+        'features': [],
+        'atmosphere': 'The air is still and quiet.',
+        'exits': ['north', 'south']
+    },
+    'search_response': {
+        'description': 'You search but find nothing unusual.',
+        'discoveries': []
+    },
+    'examine_response': {
+        'description': 'You see nothing special.',
+        'features': [],
+        'interactions': []
+    },
+    'action_response': {
+        'description': 'You proceed with your action.',
+        'success': True,
+        'next_situation': 'exploration'
+    }
+})
+
+# The same defaults as (field, value) pairs for a single pass per response
+_DEFAULTS: Final[Mapping[str, Tuple[Tuple[str, Any], ...]]] = MappingProxyType({
+    prompt_type: tuple(defaults.items())
+    for prompt_type, defaults in _RESPONSE_DEFAULTS.items()
+})
+
+_NON_JSON_TEMPLATES: Final[Mapping[str, Mapping[str, Any]]] = MappingProxyType({
+    'location_description': {
+        'name': 'Unknown Area',
+        'description': '',
+        'theme': 'generic',
+        'features': ['path'],
+        'atmosphere': 'The area has a mysterious quality.',
+        'exits': ['north', 'south']
+    },
+    'search_response': {
+        'description': '',
+        'discoveries': []
+    },
+    'examine_response': {
+        'description': '',
+        'features': [],
+        'interactions': []
+    },
+    'action_response': {
+        'description': '',
+        'success': True,
+        'next_situation': 'exploration'
+    }
+})
+
+_FALLBACKS: Final[Mapping[str, Mapping[str, Any]]] = MappingProxyType({
+    'location_description': {
+        'name': 'Mysterious Area',
+        'description': 'A mysterious area shrouded in uncertainty.',
+        'theme': 'mysterious',
+        'features': ['shadows', 'mist'],
+        'atmosphere': 'The air is thick with anticipation.',
+        'exits': ['north', 'south']
+    },
+    'search_response': {
+        'description': 'Your search reveals nothing unusual.',
+        'discoveries': []
+    },
+    'examine_response': {
+        'description': 'You see nothing special about it.',
+        'features': [],
+        'interactions': []
+    },
+    'action_response': {
+        'description': 'You proceed with your action.',
+        'success': True,
+        'next_situation': 'exploration'
+    }
+})
+
+_DEFAULT_FALLBACK: Final[Mapping[str, Any]] = MappingProxyType({
+    'description': 'The situation continues normally.',
+    'success': True,
+    'next_situation': 'exploration'
+})
+
+class _JSONScanner:
+    """Track string and brace state across streamed chunks to find where the
+    top-level JSON object ends"""
+
     def __init__(self):
+        self.is_json: Optional[bool] = None  # unknown until the first non-space character
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> int:
+        """Consume a chunk; return the index just past the closing brace, or -1"""
+        if self.is_json is False:
+            return -1
+        for index, char in enumerate(text):
+            if self.is_json is None:
+                if char.isspace():
+                    continue
+                self.is_json = char == '{'
+                if not self.is_json:
+                    return -1
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == '{':
+                self.depth += 1
+            elif char == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    return index + 1
+        return -1
+
+def _copy_response(template: Mapping[str, Any]) -> Dict[str, Any]:
+    """Copy a response table entry, including its list values"""
+    return {key: copy.copy(value) for key, value in template.items()}
+
+class AIGenerator:
+    def __init__(self, max_concurrency: int = 8, max_retries: int = 4, use_response_cache: bool = True,
+                 response_cache_path: Optional[Path] = None):
         # Setup API configuration
         api_key = setup_api()
-        self.client = OpenAI(api_key=api_key)
+        # One pooled HTTP client so requests reuse keep-alive connections
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        )
         self.prompt_manager = PromptManager()
-        self.context_history: List[Dict] = []
         self.max_context_length = 10
-        self._lock = asyncio.Lock()
-        self._setup_logging()
-
-    def _setup_logging(self):
-        """Configure logging"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        self.logger = logging.getLogger('AIGenerator')
+        self.context_history: Deque[Dict] = deque(maxlen=self.max_context_length)
+
+        # Bound the number of requests in flight instead of serializing them
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self._sem = asyncio.Semaphore(max_concurrency)
+        # (prompt type, prompt) -> task answering it, for requests in flight
+        self._coalesced: Dict[Tuple[str, str], asyncio.Task] = {}
+
+        # Repeated prompts are answered from the cache, which is only kept on
+        # disk between sessions when a response_cache_path is given
+        self.response_cache = ResponseCache(response_cache_path) if use_response_cache else None
+
+    async def generate_content(self, prompt_type: str, parameters: Dict[str, Any],
+                               reuse: bool = True) -> Dict[str, Any]:
+        """Generate content using AI with proper error handling.
 
-    async def generate_content(self, prompt_type: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate content using AI with proper error handling"""
+        Identical requests made while one is in flight share its completion,
+        and repeated prompts are answered from the response cache. Pass
+        reuse=False for content that must be fresh each time, such as a new
+        location whose prompt matches an earlier one.
+        """
+        response, _ = await self.generate_checked(prompt_type, parameters, reuse)
+        return response
+
+    async def generate_checked(self, prompt_type: str, parameters: Dict[str, Any],
+                               reuse: bool = True) -> Tuple[Dict[str, Any], bool]:
+        """generate_content, also reporting whether the model answered with valid JSON.
+
+        The flag is False for fallback and plain-text responses, which
+        callers should not keep for later requests.
+        """
         try:
-            # Get formatted prompts
-            formatted_prompt = self.prompt_manager.format_prompt(prompt_type, parameters)
-            system_prompt = self.prompt_manager.get_system_prompt()
-
-            async with self._lock:
-                # Generate response
-                response = self.client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": formatted_prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=500
-                )
-
-                response_text = response.choices[0].message.content
-                
-                # Add to context history
-                self.context_history.append({
-                    'timestamp': datetime.now(),
-                    'prompt_type': prompt_type,
-                    'response': response_text
-                })
-                
-                # Maintain history length
-                if len(self.context_history) > self.max_context_length:
-                    self.context_history.pop(0)
-
-                # Parse and validate response
-                try:
-                    result = json.loads(response_text)
-                    return self._validate_response(result, prompt_type, parameters)
-                except json.JSONDecodeError:
-                    self.logger.warning(f"Failed to parse JSON response for {prompt_type}")
-                    return self._format_non_json_response(response_text, prompt_type)
+            messages = self._build_messages(prompt_type, parameters)
+        except Exception as e:
+            logger.error("AI generation failed: %s", e)
+            return self._get_fallback_response(prompt_type), False
+
+        if not reuse:
+            return await self._generate(prompt_type, parameters, messages, reuse)
+
+        key = (prompt_type, messages[-1]['content'])
+        task = self._coalesced.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._generate(prompt_type, parameters, messages, reuse))
+            self._coalesced[key] = task
+            task.add_done_callback(lambda _: self._coalesced.pop(key, None))
+        # Shielded so one caller giving up doesn't cancel the others; each
+        # caller gets its own copy because game code mutates responses
+        response, valid = await asyncio.shield(task)
+        return copy.deepcopy(response), valid
+
+    async def _generate(self, prompt_type: str, parameters: Dict[str, Any],
+                        messages: List[Dict[str, str]], reuse: bool) -> Tuple[Dict[str, Any], bool]:
+        """Answer one request from the response cache or the API"""
+        try:
+            prompt = messages[-1]['content']
+
+            # Check the response cache first
+            if reuse and self.response_cache:
+                cached = self.response_cache.get(prompt_type, prompt)
+                if cached is not None:
+                    return cached, True
+
+            # Generate response
+            response_text = await self._create_completion(messages)
+
+            # Add to context history
+            self.context_history.append({
+                'timestamp': time.monotonic(),
+                'prompt_type': prompt_type,
+                'response': response_text
+            })
+
+            # Parse and validate response
+            try:
+                result = fast_json.loads(response_text)
+            except fast_json.JSONDecodeError:
+                logger.warning("Failed to parse JSON response for %s", prompt_type)
+                return self._format_non_json_response(response_text, prompt_type), False
+
+            result = self._validate_response(result, prompt_type, parameters)
+            if reuse and self.response_cache:
+                await self.response_cache.put(prompt_type, prompt, result)
+            return result, True
 
         except Exception as e:
-            self.logger.error(f"AI generation failed: {e}")
-            return self._get_fallback_response(prompt_type)
+            logger.error("AI generation failed: %s", e)
+            return self._get_fallback_response(prompt_type), False
 
-    def _validate_response(self, response: Dict, prompt_type: str, parameters: Dict) -> Dict:
-        """Validate and format the AI response"""
-        validators = {
-            'location_description': {
-                'required': ['name', 'description', 'theme', 'features'],
-                'defaults': {
-                    'name': 'Unknown Area',
-                    'description': 'A nondescript area stretches before you.',
-                    'theme': 'generic',
-                    'features': [],
-                    'atmosphere': 'The air is still and quiet.',
-                    'exits': ['north', 'south']
-                }
-            },
-            'search_response': {
-                'required': ['description'],
-                'defaults': {
-                    'description': 'You search but find nothing unusual.',
-                    'discoveries': []
-                }
-            },
-            'examine_response': {
-                'required': ['description'],
-                'defaults': {
-                    'description': 'You see nothing special.',
-                    'features': [],
-                    'interactions': []
-                }
-            },
-            'action_response': {
-                'required': ['description'],
-                'defaults': {
-                    'description': 'You proceed with your action.',
-                    'success': True,
-                    'next_situation': 'exploration'
-                }
-            }
+    async def generate_many(self, requests: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Generate content for several (prompt_type, parameters) pairs concurrently.
+
+        Requests fan out together but at most max_concurrency reach the API at
+        once. Results are returned in the same order as the requests.
+        """
+        results = await asyncio.gather(
+            *(self.generate_content(prompt_type, parameters) for prompt_type, parameters in requests),
+            return_exceptions=True
+        )
+        return [
+            self._get_fallback_response(prompt_type) if isinstance(result, BaseException) else result
+            for (prompt_type, _), result in zip(requests, results)
+        ]
+
+    async def submit_batch(self, requests: List[Tuple[str, Dict[str, Any]]],
+                           batch_dir: Path = Path("cache/batches")) -> str:
+        """Submit requests through the OpenAI Batch API and return the batch id.
+
+        Meant for pre-generating content that is not needed right away; batch
+        jobs complete within 24 hours at a reduced price. Each line's custom_id
+        is "<index>:<prompt_type>" so results can be matched back to requests.
+        """
+        batch_dir.mkdir(parents=True, exist_ok=True)
+        batch_file = batch_dir / f"batch_{datetime.now():%Y%m%d_%H%M%S_%f}.jsonl"
+        with open(batch_file, 'w') as f:
+            for index, (prompt_type, parameters) in enumerate(requests):
+                f.write(json.dumps({
+                    'custom_id': f"{index}:{prompt_type}",
+                    'method': 'POST',
+                    'url': '/v1/chat/completions',
+                    'body': self._completion_body(self._build_messages(prompt_type, parameters))
+                }) + "\n")
+
+        with open(batch_file, 'rb') as f:
+            uploaded = await self.client.files.create(file=f, purpose='batch')
+        batch = await self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+        return batch.id
+
+    def _build_messages(self, prompt_type: str, parameters: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Build the chat messages for a prompt"""
+        formatted_prompt = self.prompt_manager.format_prompt(prompt_type, parameters)
+        system_prompt = self.prompt_manager.get_system_prompt()
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": formatted_prompt}
+        ]
+
+    def _completion_body(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Get the chat completion request parameters"""
+        return {
+            'model': "gpt-3.5-turbo",
+            'messages': messages,
+            'temperature': 0.7,
+            'max_tokens': 500
         }
 
-        if prompt_type in validators:
-            validator = validators[prompt_type]
-            
-            # Check required fields
-            for field in validator['required']:
-                if field not in response:
-                    response[field] = validator['defaults'][field]
-                    
-            # Add optional defaults
-            for field, value in validator['defaults'].items():
-                if field not in response:
-                    response[field] = value
+    async def _create_completion(self, messages: List[Dict[str, str]]) -> str:
+        """Run a chat completion under the concurrency limit, backing off on transient errors"""
+        delay = 0.5
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._sem:
+                    return await self._stream_completion(messages)
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning("OpenAI request failed (%s), retrying in %.1fs",
+                               e.__class__.__name__, delay)
+                # Sleep outside the semaphore so other requests can proceed
+                await asyncio.sleep(delay)
+                delay *= 2
+
+    async def _stream_completion(self, messages: List[Dict[str, str]]) -> str:
+        """Stream a completion, returning as soon as the top-level JSON object closes"""
+        stream = await self.client.chat.completions.create(
+            **self._completion_body(messages), stream=True
+        )
+        scanner = _JSONScanner()
+        parts: List[str] = []
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                text = chunk.choices[0].delta.content
+                if not text:
+                    continue
+
+                end = scanner.feed(text)
+                if end >= 0:
+                    # Object is complete; drop trailing tokens and stop generating
+                    parts.append(text[:end])
+                    break
+                parts.append(text)
+        finally:
+            await stream.close()
+        return ''.join(parts)
 
+    def _validate_response(self, response: Dict, prompt_type: str, parameters: Dict) -> Dict:
+        """Validate and format the AI response"""
+        defaults = _DEFAULTS.get(prompt_type)
+        if defaults is None:
+            return response
+        for field, value in defaults:
+            if field not in response:
+                # Copy so responses never share the table's mutable defaults
+                response[field] = copy.copy(value)
         return response
 
     def _format_non_json_response(self, text: str, prompt_type: str) -> Dict:
         """Format plaintext response into proper structure"""
-        if prompt_type == 'location_description':
-            return {
-                'name': 'Unknown Area',
-                'description': text,
-                'theme': 'generic',
-                'features': ['path'],
-                'atmosphere': 'The area has a mysterious quality.',
-                'exits': ['north', 'south']
-            }
-        elif prompt_type == 'search_response':
-            return {
-                'description': text,
-                'discoveries': []
-            }
-        elif prompt_type == 'examine_response':
-            return {
-                'description': text,
-                'features': [],
-                'interactions': []
-            }
-        else:
-            return {
-                'description': text,
-                'success': True,
-                'next_situation': 'exploration'
-            }
+        template = _NON_JSON_TEMPLATES.get(prompt_type, _NON_JSON_TEMPLATES['action_response'])
+        response = _copy_response(template)
+        response['description'] = text
+        return response
 
     def _get_fallback_response(self, prompt_type: str) -> Dict:
         """Get appropriate fallback response"""
-        fallbacks = {
-            'location_description': {
-                'name': 'Mysterious Area',
-                'description': 'A mysterious area shrouded in uncertainty.',
-                'theme': 'mysterious',
-                'features': ['shadows', 'mist'],
-                'atmosphere': 'The air is thick with anticipation.',
-                'exits': ['north', 'south']
-            },
-            'search_response': {
-                'description': 'Your search reveals nothing unusual.',
-                'discoveries': []
-            },
-            'examine_response': {
-                'description': 'You see nothing special about it.',
-                'features': [],
-                'interactions': []
-            },
-            'action_response': {
-                'description': 'You proceed with your action.',
-                'success': True,
-                'next_situation': 'exploration'
-            }
-        }
-        return fallbacks.get(prompt_type, {
-            'description': 'The situation continues normally.',
-            'success': True,
-            'next_situation': 'exploration'
-        })
+        return _copy_response(_FALLBACKS.get(prompt_type, _DEFAULT_FALLBACK))
 
     async def cleanup(self):
         """Cleanup resources"""
         self.context_history.clear()
+        if self.response_cache:
+            self.response_cache.clear()
+        await self.client.close()
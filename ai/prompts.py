@@ -1,12 +1,32 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import json
 from pathlib import Path
 import logging
 
+# Static per-type formatting instructions appended to formatted prompts
+_FORMATTING_INSTRUCTIONS = {
+    'location_description': """
+            Format response as:
+            Description: (2-3 sentences of vivid description)
+            Name: (location name)
+            Features: (comma-separated list of notable features)
+            Theme: (primary theme)
+            Atmosphere: (1 sentence about the mood/feeling)
+            Secrets: (any hidden elements or hints)""",
+    
+    'npc_dialog': """
+            Format response as:
+            Dialog: (what the NPC says)
+            Action: (how they say it)
+            Intent: (their hidden motivation)"""
+}
+
 class PromptManager:
     def __init__(self):
         self.templates = self._load_templates()
         self.prompt_relationships = self._load_prompt_relationships()
+        # (prompt_type, variant) -> static text appended after the formatted base
+        self._suffix_cache: Dict[Tuple[str, Optional[str]], str] = {}
     
     def get_system_prompt(self) -> str:
         """Get the system prompt for AI context"""
@@ -28,15 +48,8 @@ class PromptManager:
             if 'purpose' not in parameters:
                 parameters['purpose'] = 'exploration'
                 
-            template = self.templates[prompt_type]['base'].format(**parameters)
-            if variant and variant in self.templates[prompt_type].get('variants', {}):
-                template += f"\n\n{self.templates[prompt_type]['variants'][variant]}"
-                
-            formatting = self._get_formatting_instructions(prompt_type)
-            if formatting:
-                template += f"\n\n{formatting}"
-                
-            return template
+            return self.templates[prompt_type]['base'].format(**parameters) + \
+                self._get_prompt_suffix(prompt_type, variant)
             
         except KeyError as e:
             logging.error(f"Missing required parameter: {e}")
@@ -45,25 +58,24 @@ class PromptManager:
             logging.error(f"Error formatting prompt with parameters: {e}")
             return self._get_fallback_template()
 
-    # ... (rest of the previous methods remain the same)    
+    def _get_prompt_suffix(self, prompt_type: str, variant: Optional[str]) -> str:
+        """Get the variant and formatting text for a prompt, built once per combination"""
+        key = (prompt_type, variant)
+        suffix = self._suffix_cache.get(key)
+        if suffix is None:
+            suffix = ""
+            variants = self.templates[prompt_type].get('variants', {})
+            if variant and variant in variants:
+                suffix += f"\n\n{variants[variant]}"
+                
+            formatting = self._get_formatting_instructions(prompt_type)
+            if formatting:
+                suffix += f"\n\n{formatting}"
+            self._suffix_cache[key] = suffix
+        return suffix
+
     def _get_formatting_instructions(self, prompt_type: str) -> str:
-        formatting_instructions = {
-            'location_description': """
-            Format response as:
-            Description: (2-3 sentences of vivid description)
-            Name: (location name)
-            Features: (comma-separated list of notable features)
-            Theme: (primary theme)
-            Atmosphere: (1 sentence about the mood/feeling)
-            Secrets: (any hidden elements or hints)""",
-            
-            'npc_dialog': """
-            Format response as:
-            Dialog: (what the NPC says)
-            Action: (how they say it)
-            Intent: (their hidden motivation)"""
-        }
-        return formatting_instructions.get(prompt_type, "")
+        return _FORMATTING_INSTRUCTIONS.get(prompt_type, "")
     
     def _get_fallback_template(self) -> str:
         return "Please describe what happens next in the game."
@@ -1,4 +1,4 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional
 import asyncio
 import logging
 from gtts import gTTS
@@ -11,69 +11,129 @@ import hashlib
 from .audio_manager import AudioManager
 
 class AudioDescription:
-    def __init__(self, audio_manager: AudioManager):
+    def __init__(self, audio_manager: AudioManager, tts_workers: int = 4):
         self.audio_manager = audio_manager
         self.last_description = None
+        self._last_fingerprint: Optional[int] = None
         self.enabled = True
 
+        # Descriptions are voiced by background workers; only the newest
+        # scene is ever played, older queued ones are dropped
+        self.tts_workers = tts_workers
+        self._tts_queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._scene_seq = 0
+
     def _generate_description(self, scene_data: Dict[str, Any]) -> str:
         """Generate descriptive text from scene data"""
-        lines = []
-        
+        return " ".join(line for line in self._description_lines(scene_data) if line)
+
+    def _description_lines(self, scene_data: Dict[str, Any]) -> Iterator[str]:
+        """Yield the sentences describing a scene"""
         if 'location' in scene_data:
             loc = scene_data['location']
             # Start with main description
-            lines.append(loc.get('description', ''))
+            yield loc.get('description', '')
             
             # Add details about visible features
             features = loc.get('features', [])
             if features:
-                lines.append(f"You notice {', '.join(features)}.")
+                yield f"You notice {', '.join(features)}."
             
             # Add information about visible items
-            items = loc.get('items', [])
-            if items:
-                item_names = [item.get('name') for item in items 
-                            if not item.get('is_taken')]
-                if item_names:
-                    lines.append(f"There are items here: {', '.join(item_names)}.")
+            item_names = ', '.join(item.get('name') for item in loc.get('items', [])
+                                   if not item.get('is_taken'))
+            if item_names:
+                yield f"There are items here: {item_names}."
             
             # Add information about NPCs
-            npcs = loc.get('npcs', [])
-            if npcs:
-                npc_names = [npc.get('name') for npc in npcs 
-                           if not npc.get('is_defeated')]
-                if npc_names:
-                    lines.append(f"You see: {', '.join(npc_names)}.")
+            npc_names = ', '.join(npc.get('name') for npc in loc.get('npcs', [])
+                                  if not npc.get('is_defeated'))
+            if npc_names:
+                yield f"You see: {npc_names}."
             
             # Add available exits
             exits = loc.get('exits', [])
             if exits:
-                lines.append(f"You can go: {', '.join(exits)}.")
+                yield f"You can go: {', '.join(exits)}."
 
         # Add combat information if relevant
         if scene_data.get('in_combat'):
             enemy = scene_data.get('enemy', {})
             if enemy:
-                lines.append(f"You are in combat with {enemy.get('name')}.")
-                lines.append(f"Your health is {scene_data.get('player_hp')} "
-                           f"out of {scene_data.get('player_max_hp')}.")
-                lines.append(f"The enemy's health is {enemy.get('hp')} "
-                           f"out of {enemy.get('max_hp')}.")
+                yield f"You are in combat with {enemy.get('name')}."
+                yield (f"Your health is {scene_data.get('player_hp')} "
+                       f"out of {scene_data.get('player_max_hp')}.")
+                yield (f"The enemy's health is {enemy.get('hp')} "
+                       f"out of {enemy.get('max_hp')}.")
 
-        return " ".join(lines)
+    @staticmethod
+    def _fingerprint(scene_data: Dict[str, Any]) -> int:
+        """Hash everything the spoken description depends on"""
+        loc = scene_data.get('location') or {}
+        return hash((
+            loc.get('description'),
+            tuple(loc.get('features', [])),
+            tuple(item.get('name') for item in loc.get('items', []) if not item.get('is_taken')),
+            tuple(npc.get('name') for npc in loc.get('npcs', []) if not npc.get('is_defeated')),
+            tuple(loc.get('exits', [])),
+            bool(scene_data.get('in_combat')),
+            scene_data.get('player_hp'),
+            scene_data.get('player_max_hp'),
+            (scene_data.get('enemy') or {}).get('hp')
+        ))
 
     async def describe_scene(self, scene_data: Dict[str, Any], voice: str = "alloy"):
         """Generate and speak scene description"""
         if not self.enabled:
             return
+
+        # Skip building the description when the scene has not changed
+        fingerprint = self._fingerprint(scene_data)
+        if fingerprint == self._last_fingerprint:
+            return
             
         description = self._generate_description(scene_data)
         
         # Only speak if description has changed
         if description != self.last_description:
-            await self.audio_manager.speak(description, voice)
+            self._ensure_workers()
+            self._scene_seq += 1
+            await self._tts_queue.put((self._scene_seq, description, voice))
             self.last_description = description
+        self._last_fingerprint = fingerprint
+
+    def _ensure_workers(self):
+        """Start the TTS workers on the running loop the first time they are needed"""
+        if self._tts_queue is None:
+            self._tts_queue = asyncio.Queue()
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._tts_worker())
+                             for _ in range(self.tts_workers)]
+
+    async def _tts_worker(self):
+        """Synthesize queued descriptions and play the one for the current scene"""
+        while True:
+            seq, description, voice = await self._tts_queue.get()
+            try:
+                if seq != self._scene_seq:
+                    continue  # A newer scene was queued; skip the API call entirely
+                await self.audio_manager.prefetch([description], voice)
+                if seq == self._scene_seq and self.enabled:
+                    # The previous scene may still be talking; the new one replaces it
+                    self.audio_manager.stop_narration()
+                    await self.audio_manager.speak(description, voice)
+            except Exception as e:
+                logging.error(f"Error speaking scene description: {e}")
+            finally:
+                self._tts_queue.task_done()
+
+    async def close(self):
+        """Stop the TTS workers"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
 
     def toggle_descriptions(self, enabled: bool):
         """Toggle audio descriptions on/off"""
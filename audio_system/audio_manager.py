@@ -1,83 +1,377 @@
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 import pygame
 import pygame.mixer
 import asyncio
+import functools
 from pathlib import Path
 import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, Iterator, List, Optional
 import os
+import re
 import tempfile
+import uuid
+import weakref
+
+# Typographic variants that the TTS voice pronounces identically
+_SPEECH_PUNCTUATION = str.maketrans({
+    '\u2018': "'", '\u2019': "'", '\u201c': '"', '\u201d': '"',
+    '\u2013': '-', '\u2014': '-', '\u2026': '...'
+})
+
+def _normalize_speech(text: str) -> str:
+    """Canonical form of a line for audio cache lookups"""
+    return ' '.join(text.translate(_SPEECH_PUNCTUATION).split())
+
+# Larger buffer than pygame's default keeps the mixer from starving other audio clients
+MIXER_SETTINGS = {'frequency': 44100, 'size': -16, 'channels': 2, 'buffer': 4096}
+MIXER_CHANNELS = 32
+MAX_MIXER_CHANNELS = 64
+CHANNEL_GROWTH = 8
+
+# Channel 0 is reserved for narration so effects can never take it over
+NARRATION_CHANNEL = 0
+
+def ensure_mixer() -> None:
+    """Initialize the pygame mixer once per process"""
+    if not pygame.mixer.get_init():
+        pygame.mixer.init(**MIXER_SETTINGS)
+        pygame.mixer.set_num_channels(MIXER_CHANNELS)
+        pygame.mixer.set_reserved(NARRATION_CHANNEL + 1)
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+# Sentences decoded ahead of the one that is playing
+SPEECH_LOOKAHEAD = 2
+
+def _split_sentences(text: str) -> List[str]:
+    """Split narration into sentences to synthesize separately"""
+    return [sentence for sentence in _SENTENCE_END.split(text.strip()) if sentence]
 
 class AudioManager:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, sound_pool_size: int = 64, max_tts_requests: int = 8,
+                 cache_max_bytes: int = 200 * 1024 * 1024):
         """Initialize audio manager with OpenAI client"""
-        self.client = OpenAI(api_key=api_key)
-        
-        # Initialize pygame mixer for audio playback
-        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=2048)
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(limits=httpx.Limits(max_connections=20, max_keepalive_connections=20))
+        )
         
         # Create cache directory
         self.cache_dir = Path("cache/audio")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
-        # Set up audio channels
-        self.description_channel = pygame.mixer.Channel(0)
-        self.effect_channel = pygame.mixer.Channel(1)
+        # The narration channel is created with the mixer on first playback
+        self._description_channel: Optional[pygame.mixer.Channel] = None
         
-        self.current_audio = None
+        # Weak so the sound pool alone decides how long decoded speech lives
+        self._current_audio: Optional[weakref.ref] = None
         self._volume = 1.0
         self.is_speaking = False
+        # Bumped by stop_audio so a running speak() knows it has been cut off
+        self._speech_generation = 0
+
+        # Resolved when narration finishes or is stopped
+        self._playback_done: Optional[asyncio.Future] = None
+        self._playback_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Bound concurrent TTS downloads to stay within the API's rate limits
+        self._tts_sem = asyncio.Semaphore(max_tts_requests)
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        # Audio file I/O and decoding get their own threads so bursts of
+        # narration don't starve the default executor
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="audio")
+
+        # On-disk TTS cache is capped; indexed lazily on the first download
+        self.cache_max_bytes = cache_max_bytes
+        self._disk_index: "Optional[OrderedDict[str, int]]" = None
+        self._disk_bytes = 0
+
+        # Recently spoken lines stay decoded so repeats skip disk I/O and decoding
+        self.sound_pool_size = sound_pool_size
+        self._sound_pool: "OrderedDict[str, pygame.mixer.Sound]" = OrderedDict()
         
         # Create sound effects directory if it doesn't exist
         self.effects_dir = Path("assets/audio/effects")
         self.effects_dir.mkdir(parents=True, exist_ok=True)
 
+        # Effects are few and short, so they stay decoded for the whole session
+        self._effects: Dict[str, pygame.mixer.Sound] = {}
+
+    @property
+    def description_channel(self) -> pygame.mixer.Channel:
+        """Channel reserved for spoken narration"""
+        if self._description_channel is None:
+            ensure_mixer()
+            self._description_channel = pygame.mixer.Channel(NARRATION_CHANNEL)
+            self._description_channel.set_volume(self._volume)
+        return self._description_channel
+
+    @property
+    def current_audio(self) -> Optional[pygame.mixer.Sound]:
+        """The most recently played narration clip, if it is still loaded"""
+        return self._current_audio() if self._current_audio is not None else None
+
     async def speak(self, text: str, voice: str = "alloy") -> None:
-        """Generate and play speech using OpenAI TTS"""
+        """Generate and play speech using OpenAI TTS.
+
+        Longer text is spoken sentence by sentence, with the next sentence
+        synthesized while the current one plays.
+        """
+        producer = None
+        generation = self._speech_generation
         try:
             if not text or self.is_speaking:
                 return
 
             self.is_speaking = True
-            
-            # Create cache key from text and voice
-            cache_key = hashlib.md5(f"{text}{voice}".encode()).hexdigest()
-            cache_file = self.cache_dir / f"{cache_key}.mp3"
-
-            # Check cache first
-            if not cache_file.exists():
-                # Use OpenAI's TTS API
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.client.audio.speech.create(
-                        model="tts-1",
-                        voice=voice,
-                        input=text
-                    )
-                )
-                
-                # Save the binary content
-                with open(cache_file, "wb") as f:
-                    f.write(response.content)
 
-            # Play the audio using pygame
-            sound = pygame.mixer.Sound(str(cache_file))
-            self.description_channel.set_volume(self._volume)
-            self.description_channel.play(sound)
-            
-            # Wait for the sound to finish playing
-            while self.description_channel.get_busy():
-                await asyncio.sleep(0.1)
+            # Small lookahead so synthesis stays just ahead of playback
+            sounds: asyncio.Queue = asyncio.Queue(maxsize=SPEECH_LOOKAHEAD)
+            producer = asyncio.create_task(self._produce_speech(_split_sentences(text), voice, sounds))
+
+            loop = asyncio.get_running_loop()
+            channel = self.description_channel
+            ends_at = loop.time()  # when the sentence on the channel finishes
+            while True:
+                sound = await sounds.get()
+                # stop_audio may have run while this sentence was being synthesized
+                if sound is None or generation != self._speech_generation:
+                    break
+                if channel.get_busy():
+                    # SDL starts the queued sentence the moment the current one ends
+                    channel.queue(sound)
+                    await self._wait_for_playback(ends_at - loop.time())
+                    ends_at += sound.get_length()
+                else:
+                    channel.play(sound)
+                    ends_at = loop.time() + sound.get_length()
+                self._current_audio = weakref.ref(sound)
+
+            if generation != self._speech_generation:
+                return
 
-            self.current_audio = sound
-            self.is_speaking = False
+            # Wait for the last sentence to finish playing
+            await self._wait_for_playback(ends_at - loop.time())
+
+            # Surface synthesis errors
+            if producer.done():
+                producer.result()
+            if generation == self._speech_generation:
+                self.is_speaking = False
 
         except Exception as e:
             logging.error(f"Error generating/playing speech: {e}")
-            self.is_speaking = False
+            if generation == self._speech_generation:
+                self.is_speaking = False
+            raise
+        finally:
+            if producer is not None and not producer.done():
+                producer.cancel()
+
+    async def _produce_speech(self, sentences: List[str], voice: str, sounds: asyncio.Queue) -> None:
+        """Load each sentence's audio in order, ending the queue with None"""
+        try:
+            for sentence in sentences:
+                await sounds.put(await self._load_speech(sentence, voice))
+            await sounds.put(None)
+        except Exception:
+            # Wake the consumer so it can report the failure
+            while not sounds.empty():
+                sounds.get_nowait()
+            sounds.put_nowait(None)
             raise
 
+    async def _load_speech(self, text: str, voice: str) -> pygame.mixer.Sound:
+        """Get the decoded audio for one line, synthesizing it if needed"""
+        cache_file = self._cache_file(text, voice)
+        sound = self._pooled_sound(cache_file)
+
+        if sound is None:
+            await self._synthesize(text, voice, cache_file)
+            # Decode the audio off the event loop and keep it resident
+            ensure_mixer()
+            sound = await self._run_blocking(pygame.mixer.Sound, str(cache_file))
+            self._add_to_pool(cache_file, sound)
+        return sound
+
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run blocking file I/O or decoding on the audio executor"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _wait_for_playback(self, length: float) -> None:
+        """Sleep until the narration clip ends, or until stop_audio interrupts it"""
+        loop = asyncio.get_running_loop()
+        self._playback_loop = loop
+        self._playback_done = loop.create_future()
+        timer = loop.call_later(length, self._finish_playback)
+        try:
+            await self._playback_done
+        finally:
+            timer.cancel()
+            self._playback_done = None
+
+    def _finish_playback(self) -> None:
+        """Wake the coroutine waiting on the current narration clip"""
+        if self._playback_done is not None and not self._playback_done.done():
+            self._playback_done.set_result(None)
+
+    async def synthesize(self, text: str, voice: str = "alloy") -> Path:
+        """Make sure speech for the text is in the disk cache and return its file"""
+        return await self._synthesize(text, voice, self._cache_file(text, voice))
+
+    async def _synthesize(self, text: str, voice: str, cache_file: Path) -> Path:
+        """synthesize() for callers that already resolved the cache file"""
+        # Check cache first
+        if await self._run_blocking(cache_file.exists):
+            await self._touch_cached(cache_file)
+            return cache_file
+
+        # Concurrent requests for the same line share one download
+        key = cache_file.stem
+        download = self._inflight.get(key)
+        if download is None:
+            download = asyncio.create_task(self._download_speech(text, voice, cache_file))
+            self._inflight[key] = download
+            download.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller being cancelled doesn't abort the others' download
+        await asyncio.shield(download)
+        return cache_file
+
+    async def _download_speech(self, text: str, voice: str, cache_file: Path) -> None:
+        """Stream OpenAI's TTS response into the cache file"""
+        # Unique temp name, renamed into place only once the download is complete
+        temp_file = cache_file.with_name(f"{cache_file.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            async with self._tts_sem:
+                async with self.client.audio.speech.with_streaming_response.create(
+                    model="tts-1",
+                    voice=voice,
+                    input=text,
+                    response_format="mp3"
+                ) as response:
+                    f = await self._run_blocking(open, temp_file, 'wb')
+                    try:
+                        async for chunk in response.iter_bytes(8192):
+                            await self._run_blocking(f.write, chunk)
+                    finally:
+                        await self._run_blocking(f.close)
+            await self._run_blocking(os.replace, temp_file, cache_file)
+        except BaseException:
+            temp_file.unlink(missing_ok=True)
+            raise
+        await self._record_cached(cache_file)
+
+    def _load_disk_index(self) -> None:
+        """Index the cached MP3s from least to most recently used"""
+        entries = []
+        for path in self.cache_dir.glob("*.mp3"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.name, stat.st_size))
+        entries.sort()
+        self._disk_index = OrderedDict((name, size) for _, name, size in entries)
+        self._disk_bytes = sum(self._disk_index.values())
+
+    async def _touch_cached(self, cache_file: Path) -> None:
+        """Mark a cached MP3 as recently used, in memory and on disk"""
+        if self._disk_index is not None and cache_file.name in self._disk_index:
+            self._disk_index.move_to_end(cache_file.name)
+        try:
+            await self._run_blocking(os.utime, cache_file)
+        except OSError:
+            pass
+
+    async def _record_cached(self, cache_file: Path) -> None:
+        """Add a new MP3 to the index and evict the oldest ones past the size cap"""
+        if self._disk_index is None:
+            await self._run_blocking(self._load_disk_index)
+        else:
+            size = (await self._run_blocking(cache_file.stat)).st_size
+            self._disk_bytes += size - self._disk_index.pop(cache_file.name, 0)
+            self._disk_index[cache_file.name] = size
+
+        evicted = []
+        # Never evict the file that was just written
+        while self._disk_bytes > self.cache_max_bytes and len(self._disk_index) > 1:
+            name, size = self._disk_index.popitem(last=False)
+            self._disk_bytes -= size
+            evicted.append(self.cache_dir / name)
+        if evicted:
+            await self._run_blocking(self._unlink_all, evicted)
+
+    @staticmethod
+    def _unlink_all(paths: List[Path]) -> None:
+        """Delete evicted cache files"""
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    async def prefetch(self, texts: List[str], voice: str = "alloy") -> None:
+        """Download speech for upcoming lines concurrently so they play without delay"""
+        # Split like speak() does so the prefetched files are the ones it plays
+        sentences = dict.fromkeys(sentence for text in texts for sentence in _split_sentences(text))
+        results = await asyncio.gather(
+            *(self.synthesize(sentence, voice) for sentence in sentences),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logging.warning(f"Error prefetching speech: {result}")
+
+    def _cache_file(self, text: str, voice: str) -> Path:
+        """Disk cache location for a spoken line"""
+        return self.cache_dir / f"{self._cache_key(text, voice)}.mp3"
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _cache_key(text: str, voice: str) -> str:
+        """Create cache key from text and voice.
+
+        The text is normalized first so lines that differ only in spacing
+        or typographic punctuation share one recording. Case is kept, since
+        the voice reads acronyms like "HP" differently from words. Keys for
+        recently spoken lines are memoized, so stock phrases skip hashing.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(voice.encode())
+        h.update(b"\x1f")
+        h.update(_normalize_speech(text).encode())
+        return h.hexdigest()
+
+    def _pooled_sound(self, path: Path) -> Optional[pygame.mixer.Sound]:
+        """Get an already decoded sound, marking it recently used"""
+        key = str(path)
+        sound = self._sound_pool.get(key)
+        if sound is not None:
+            self._sound_pool.move_to_end(key)
+        return sound
+
+    def _add_to_pool(self, path: Path, sound: pygame.mixer.Sound) -> None:
+        """Keep a decoded sound, evicting the least recently used one when full"""
+        self._sound_pool[str(path)] = sound
+        if len(self._sound_pool) > self.sound_pool_size:
+            self._sound_pool.popitem(last=False)
+
+    async def preload_effects(self) -> None:
+        """Decode every effect file up front so play_effect never touches disk"""
+        ensure_mixer()
+        paths = [path for path in self.effects_dir.glob("*.wav") if path.name not in self._effects]
+        sounds = await asyncio.gather(
+            *(self._run_blocking(pygame.mixer.Sound, str(path)) for path in paths),
+            return_exceptions=True
+        )
+        for path, sound in zip(paths, sounds):
+            if isinstance(sound, Exception):
+                logging.warning(f"Error loading effect {path.name}: {sound}")
+            else:
+                self._effects[path.name] = sound
+
     def play_effect(self, effect_name: str) -> None:
         """Play a sound effect"""
         try:
@@ -85,33 +379,71 @@ class AudioManager:
             if not effect_name.endswith('.wav'):
                 effect_name += '.wav'
                 
-            effect_path = self.effects_dir / effect_name
-            
-            # If the effect doesn't exist, log a warning but don't crash
-            if not effect_path.exists():
-                logging.warning(f"Sound effect not found: {effect_name}")
-                return
+            sound = self._effects.get(effect_name)
+            if sound is None:
+                effect_path = self.effects_dir / effect_name
                 
-            sound = pygame.mixer.Sound(str(effect_path))
-            self.effect_channel.set_volume(self._volume)
-            self.effect_channel.play(sound)
+                # If the effect doesn't exist, log a warning but don't crash
+                if not effect_path.exists():
+                    logging.warning(f"Sound effect not found: {effect_name}")
+                    return
+                    
+                ensure_mixer()
+                sound = self._effects[effect_name] = pygame.mixer.Sound(str(effect_path))
+            self._play_effect_on_free_channel(sound)
         except Exception as e:
             logging.error(f"Error playing effect {effect_name}: {e}")
 
+    def _play_effect_on_free_channel(self, sound: pygame.mixer.Sound) -> None:
+        """Play an effect on an idle channel, adding channels when all are busy"""
+        channel = pygame.mixer.find_channel()
+        num_channels = pygame.mixer.get_num_channels()
+        if channel is None and num_channels < MAX_MIXER_CHANNELS:
+            pygame.mixer.set_num_channels(min(num_channels + CHANNEL_GROWTH, MAX_MIXER_CHANNELS))
+            channel = pygame.mixer.find_channel()
+        if channel is None:
+            logging.warning("No free audio channel for sound effect")
+            return
+        channel.set_volume(self._volume)
+        channel.play(sound)
+
+    def _effect_channels(self) -> Iterator[pygame.mixer.Channel]:
+        """Every channel effects may play on"""
+        return (pygame.mixer.Channel(i)
+                for i in range(NARRATION_CHANNEL + 1, pygame.mixer.get_num_channels()))
+
+    def stop_narration(self):
+        """Cut off the narration that is playing, leaving sound effects alone"""
+        if pygame.mixer.get_init():
+            self.description_channel.stop()
+        if self._playback_done is not None:
+            # May be called from the UI thread, so hand the wake-up to the loop
+            self._playback_loop.call_soon_threadsafe(self._finish_playback)
+        self._current_audio = None
+        self._speech_generation += 1
+        self.is_speaking = False
+
     def stop_audio(self):
         """Stop current audio playback"""
-        self.description_channel.stop()
-        self.effect_channel.stop()
-        self.current_audio = None
-        self.is_speaking = False
+        self.stop_narration()
+        if pygame.mixer.get_init():
+            for channel in self._effect_channels():
+                channel.stop()
 
     def set_volume(self, volume: float):
         """Set volume level (0.0 to 1.0)"""
         self._volume = max(0.0, min(1.0, volume))
-        self.description_channel.set_volume(self._volume)
-        self.effect_channel.set_volume(self._volume)
+        # Not yet initialized channels pick the volume up when they first play
+        if pygame.mixer.get_init():
+            self.description_channel.set_volume(self._volume)
+            for channel in self._effect_channels():
+                channel.set_volume(self._volume)
 
     def cleanup(self):
         """Clean up resources"""
         self.stop_audio()
+        self._sound_pool.clear()
+        self._effects.clear()
+        self._description_channel = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
         pygame.mixer.quit()
\ No newline at end of file
@@ -1,10 +1,15 @@
 # settings.py
 from pathlib import Path
-from typing import Dict, Any, Optional
-import json
+from typing import Dict, Any, Mapping, Optional, Tuple
+from types import MappingProxyType
+import copy
+import os
+import threading
 from enum import Enum
 import logging
 
+from utils import fast_json
+
 class DifficultyLevel(Enum):
     EASY = "easy"
     NORMAL = "normal"
@@ -17,6 +22,37 @@ class GameMode(Enum):
     HARDCORE = "hardcore"
     ADVENTURE = "adventure"
 
+# Seconds to wait after a change before writing settings to disk
+SAVE_DELAY = 0.5
+
+# Read-only so callers can't change the shared table
+_DIFFICULTY_TABLE: Mapping[str, Mapping[str, float]] = MappingProxyType({
+    'easy': MappingProxyType({
+        'enemy_hp_multiplier': 0.8,
+        'enemy_damage_multiplier': 0.8,
+        'loot_quality': 1.2,
+        'xp_multiplier': 1.2
+    }),
+    'normal': MappingProxyType({
+        'enemy_hp_multiplier': 1.0,
+        'enemy_damage_multiplier': 1.0,
+        'loot_quality': 1.0,
+        'xp_multiplier': 1.0
+    }),
+    'hard': MappingProxyType({
+        'enemy_hp_multiplier': 1.2,
+        'enemy_damage_multiplier': 1.2,
+        'loot_quality': 0.8,
+        'xp_multiplier': 0.8
+    }),
+    'nightmare': MappingProxyType({
+        'enemy_hp_multiplier': 1.5,
+        'enemy_damage_multiplier': 1.5,
+        'loot_quality': 0.6,
+        'xp_multiplier': 0.6
+    })
+})
+
 class Settings:
     DEFAULT_CONFIG = {
         "game": {
@@ -68,13 +104,21 @@ class Settings:
             "treasure_quality": "balanced",
             "discovery_bonus": True,
             "milestone_rewards": True
+        },
+        "audio": {
+            "cache_max_mb": 200
         }
     }
 
     def __init__(self, config_path: Optional[Path] = None):
         self.config_path = config_path or Path("config/game_settings.json")
-        self.settings = self._load_settings()
         self._setup_logging()
+        self.settings = self._load_settings()
+        # Resolved key paths; cleared whenever a setting changes
+        self._get_cache: Dict[Tuple[str, ...], Any] = {}
+        # Pending debounced save, if any
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.Lock()
 
     def _setup_logging(self):
         """Configure logging"""
@@ -92,9 +136,8 @@ class Settings:
         """Load settings from file or use defaults"""
         try:
             if self.config_path.exists():
-                with open(self.config_path, 'r') as f:
-                    user_settings = json.load(f)
-                    return self._merge_settings(self.DEFAULT_CONFIG, user_settings)
+                user_settings = fast_json.load_file(self.config_path)
+                return self._merge_settings(self.DEFAULT_CONFIG, user_settings)
         except Exception as e:
             self.logger.error(f"Error loading settings: {e}")
         return self.DEFAULT_CONFIG.copy()
@@ -102,30 +145,58 @@ class Settings:
     def _merge_settings(self, default: Dict, user: Dict) -> Dict:
         """Merge user settings with defaults"""
         merged = default.copy()
-        for key, value in user.items():
-            if key in merged and isinstance(merged[key], dict):
-                if isinstance(value, dict):
-                    merged[key] = self._merge_settings(merged[key], value)
-            else:
-                merged[key] = value
+        # Walk the overrides with an explicit stack, copying only the nested
+        # sections that the user actually overrides
+        stack = [(merged, user)]
+        while stack:
+            target, overrides = stack.pop()
+            for key, value in overrides.items():
+                current = target.get(key)
+                if isinstance(current, dict):
+                    if isinstance(value, dict):
+                        current = target[key] = current.copy()
+                        stack.append((current, value))
+                else:
+                    # User values may come from the shared parse cache; copy containers
+                    target[key] = copy.deepcopy(value) if isinstance(value, (dict, list)) else value
         return merged
     
     def save_settings(self) -> None:
         """Save current settings to file"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
         try:
             self.config_path.parent.mkdir(exist_ok=True)
-            with open(self.config_path, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+            data = fast_json.dumps(self.settings, indent=True)
+            # Write beside the real file and swap it in so a crash never truncates it
+            temp_path = self.config_path.with_suffix('.json.tmp')
+            temp_path.write_bytes(data)
+            os.replace(temp_path, self.config_path)
         except Exception as e:
             self.logger.error(f"Error saving settings: {e}")
+
+    def _schedule_save(self) -> None:
+        """Save shortly after the last change, coalescing bursts of set() calls"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(SAVE_DELAY, self.save_settings)
+            self._save_timer.start()
     
     def get(self, *keys: str) -> Any:
         """Get a setting value by key path"""
+        try:
+            return self._get_cache[keys]
+        except KeyError:
+            pass
         value = self.settings
         for key in keys:
             value = value.get(key)
             if value is None:
-                return None
+                break
+        self._get_cache[keys] = value
         return value
     
     def set(self, value: Any, *keys: str) -> None:
@@ -134,34 +205,9 @@ class Settings:
         for key in keys[:-1]:
             settings = settings.setdefault(key, {})
         settings[keys[-1]] = value
-        self.save_settings()
+        self._get_cache.clear()
+        self._schedule_save()
 
-    def get_difficulty_settings(self) -> Dict[str, Any]:
+    def get_difficulty_settings(self) -> Mapping[str, float]:
         """Get current difficulty settings"""
-        difficulty = self.get('game', 'difficulty')
-        return {
-            'easy': {
-                'enemy_hp_multiplier': 0.8,
-                'enemy_damage_multiplier': 0.8,
-                'loot_quality': 1.2,
-                'xp_multiplier': 1.2
-            },
-            'normal': {
-                'enemy_hp_multiplier': 1.0,
-                'enemy_damage_multiplier': 1.0,
-                'loot_quality': 1.0,
-                'xp_multiplier': 1.0
-            },
-            'hard': {
-                'enemy_hp_multiplier': 1.2,
-                'enemy_damage_multiplier': 1.2,
-                'loot_quality': 0.8,
-                'xp_multiplier': 0.8
-            },
-            'nightmare': {
-                'enemy_hp_multiplier': 1.5,
-                'enemy_damage_multiplier': 1.5,
-                'loot_quality': 0.6,
-                'xp_multiplier': 0.6
-            }
-        }.get(difficulty, 'normal')
+        return _DIFFICULTY_TABLE.get(self.get('game', 'difficulty'), _DIFFICULTY_TABLE['normal'])
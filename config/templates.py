@@ -1,28 +1,65 @@
-from typing import Dict, List
-import json
+from typing import Any, Callable, Dict, List
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from string import Formatter
+
+from utils import fast_json
+
+_FORMATTER = Formatter()
+
+@functools.lru_cache(maxsize=1)
+def _load_templates() -> Dict[str, Dict]:
+    """Load all prompt templates once per process"""
+    template_dir = Path(__file__).parent / 'templates'
+    template_files = list(template_dir.glob('*.json'))
+    if len(template_files) <= 1:
+        return {path.stem: fast_json.load_file(path) for path in template_files}
+
+    # Read and parse the category files concurrently
+    with ThreadPoolExecutor(max_workers=min(8, len(template_files))) as pool:
+        parsed = pool.map(fast_json.load_file, template_files)
+        return {path.stem: data for path, data in zip(template_files, parsed)}
+
+def _compile(template: str) -> Callable[..., str]:
+    """Split a str.format template once so rendering only looks up fields"""
+    parts = tuple(_FORMATTER.parse(template))
+
+    def render(**kwargs: Any) -> str:
+        out = []
+        for literal, field, spec, conversion in parts:
+            out.append(literal)
+            if field is not None:
+                value = _FORMATTER.get_field(field, (), kwargs)[0]
+                if conversion:
+                    value = _FORMATTER.convert_field(value, conversion)
+                out.append(format(value, spec or ''))
+        return ''.join(out)
+
+    return render
+
+@functools.lru_cache(maxsize=None)
+def _compiled(category: str, template_name: str) -> Callable[..., str]:
+    """Compile a template's base text, once per template"""
+    template = _load_templates().get(category, {}).get(template_name)
+    if template is None:
+        raise KeyError(f"No template {category}/{template_name}")
+    if isinstance(template, dict):
+        template = template['base']
+    return _compile(template)
 
 class PromptTemplates:
     def __init__(self):
-        self.templates = self._load_templates()
-        
-    def _load_templates(self) -> Dict[str, Dict]:
-        """Load all prompt templates"""
-        template_dir = Path(__file__).parent / 'templates'
-        templates = {}
-        
-        # Load each template category
-        for template_file in template_dir.glob('*.json'):
-            category = template_file.stem
-            with open(template_file, 'r') as f:
-                templates[category] = json.load(f)
-                
-        return templates
+        self.templates = _load_templates()
     
     def get_template(self, category: str, template_name: str) -> str:
         """Get a specific template"""
         return self.templates.get(category, {}).get(template_name)
 
+    def get_compiled(self, category: str, template_name: str) -> Callable[..., str]:
+        """Get a template's base text as a render(**fields) callable"""
+        return _compiled(category, template_name)
+
 # Example template files:
 
 # templates/location_templates.json
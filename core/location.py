@@ -1,11 +1,12 @@
 # location.py
-from typing import Dict, List, Optional, Any
+from typing import Dict, FrozenSet, Iterator, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from entities.npcs import NPC
 from entities.items import Item
+from utils.fuzzy import best_match, fuzzy_score
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     id: str
     name: str
@@ -21,9 +22,107 @@ class Location:
     visited: bool = False
     hidden_items: List[Item] = field(default_factory=list)
     searchable_features: Dict[str, List[str]] = field(default_factory=dict)
-    
+    # Lowercased features and their word sets, parallel to features
+    _features_lc: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    _feature_words: List[FrozenSet[str]] = field(default_factory=list, init=False, repr=False, compare=False)
+    # Lowercased item name -> items here with that name, in list order
+    _items_by_name: Dict[str, List[Item]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _items_by_id: Dict[str, Item] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Lowercased NPC name -> NPCs here with that name, and NPCs by id
+    _npcs_by_name: Dict[str, List[NPC]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _npcs_by_id: Dict[str, NPC] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Directions whose '<direction>_locked' state is set
+    _locked_exits: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    # Bumped when NPCs, items, exits or features are added or removed
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+    # (version, NPC defeated flags, item taken flags) -> rendered description
+    _description_cache: Optional[Tuple[Tuple, str]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._index_features()
+        for item in self.items:
+            self._index_item(item)
+        for npc in self.npcs:
+            self._index_npc(npc)
+        for key, value in self.state_changes.items():
+            self._track_lock(key, value)
+
+    def _index_item(self, item: Item) -> None:
+        self._items_by_name.setdefault(item.name.lower(), []).append(item)
+        self._items_by_id[item.id] = item
+
+    def _index_npc(self, npc: NPC) -> None:
+        self._npcs_by_name.setdefault(npc.name.lower(), []).append(npc)
+        self._npcs_by_id[npc.id] = npc
+
+    def _track_lock(self, key: str, value: bool) -> None:
+        if key.endswith('_locked'):
+            direction = key[:-len('_locked')]
+            if value:
+                self._locked_exits.add(direction)
+            else:
+                self._locked_exits.discard(direction)
+
+    @staticmethod
+    def _unindex(index: Dict[str, List[Any]], name: str, entry: Any) -> None:
+        same_name = index[name]
+        same_name.remove(entry)
+        if not same_name:
+            del index[name]
+
+    def _index_features(self) -> None:
+        """Rebuild the lowercased feature cache"""
+        self._features_lc = [feature.lower() for feature in self.features]
+        self._feature_words = [frozenset(feature.split()) for feature in self._features_lc]
+
+    def add_feature(self, feature: str) -> None:
+        """Add a feature"""
+        self._version += 1
+        self.features.append(feature)
+        feature_lc = feature.lower()
+        self._features_lc.append(feature_lc)
+        self._feature_words.append(frozenset(feature_lc.split()))
+
+    def match_features(self, target: str, words_only: bool = False) -> Iterator[str]:
+        """Yield features matching a lowercased target, as a phrase or by any of its words"""
+        if len(self._features_lc) != len(self.features):
+            self._index_features()
+        words = target.split()
+        word_set = frozenset(words)
+        for feature, feature_lc, feature_words in zip(self.features, self._features_lc, self._feature_words):
+            if not words_only and (target in feature_lc or feature_lc in target):
+                yield feature
+            # Whole words hit the set; partial words still match as substrings
+            elif not word_set.isdisjoint(feature_words) or any(word in feature_lc for word in words):
+                yield feature
+
+    def best_feature(self, target: str, words_only: bool = False) -> Optional[str]:
+        """Best feature for a lowercased target, allowing abbreviations like 'grd trees'"""
+        matches = list(self.match_features(target, words_only))
+        if len(matches) == 1:
+            return matches[0]
+        if matches:
+            # Several features share a word with the target; prefer the closest
+            return max(matches, key=lambda feature: fuzzy_score(target, feature.lower()) or 0)
+        index = best_match(target, self._features_lc)
+        return self.features[index] if index is not None else None
+
     def get_current_description(self) -> str:
         """Get the current description reflecting the location's state"""
+        # NPCs and items can change state without going through the location
+        key = (self._version,
+               tuple(npc.is_defeated for npc in self.npcs),
+               tuple(item.is_taken for item in self.items))
+        cached = self._description_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        description = self._render_description()
+        self._description_cache = (key, description)
+        return description
+
+    def _render_description(self) -> str:
+        """Build the description from the current state"""
         description_parts = []
         
         # Main description
@@ -39,16 +138,12 @@ class Location:
             description_parts.append(self.atmosphere)
 
         # Visible NPCs
-        visible_npcs = [npc for npc in self.npcs if not npc.is_defeated]
-        if visible_npcs:
-            for npc in visible_npcs:
-                description_parts.append(f"You see {npc.name} here.")
+        description_parts.extend(f"You see {npc.name} here."
+                                 for npc in self.npcs if not npc.is_defeated)
 
         # Visible items (not hidden)
-        visible_items = [item for item in self.items if not item.is_taken]
-        if visible_items:
-            for item in visible_items:
-                description_parts.append(f"There is {item.name} here.")
+        description_parts.extend(f"There is {item.name} here."
+                                 for item in self.items if not item.is_taken)
 
         # Available exits
         if self.exits:
@@ -62,9 +157,8 @@ class Location:
         if not item_name:
             return None
             
-        item_name = item_name.lower()
-        for item in self.items:
-            if item.name.lower() == item_name and not item.is_taken:
+        for item in self._items_by_name.get(item_name.lower(), ()):
+            if not item.is_taken:
                 return item
         return None
 
@@ -93,7 +187,7 @@ class Location:
             if item.name.lower() in feature_lower:
                 found_items.append(item)
                 self.hidden_items.remove(item)
-                self.items.append(item)
+                self.add_item(item)
 
         # Check for predefined discoveries
         discoveries = self.searchable_features.get(feature_lower, [])
@@ -111,40 +205,52 @@ class Location:
 
     def add_npc(self, npc: NPC) -> None:
         """Add an NPC to the location"""
+        self._version += 1
         self.npcs.append(npc)
+        self._index_npc(npc)
 
     def remove_npc(self, npc_id: str) -> Optional[NPC]:
         """Remove and return an NPC"""
-        for i, npc in enumerate(self.npcs):
-            if npc.id == npc_id:
-                return self.npcs.pop(i)
-        return None
+        npc = self._npcs_by_id.pop(npc_id, None)
+        if npc is None:
+            return None
+        self._version += 1
+        self.npcs.remove(npc)
+        self._unindex(self._npcs_by_name, npc.name.lower(), npc)
+        return npc
 
     def get_npc(self, npc_name: str) -> Optional[NPC]:
         """Get NPC by name"""
         if not npc_name:
             return None
-        for npc in self.npcs:
-            if npc.name.lower() == npc_name.lower() and not npc.is_defeated:
+        for npc in self._npcs_by_name.get(npc_name.lower(), ()):
+            if not npc.is_defeated:
                 return npc
         return None
 
     def add_item(self, item: Item) -> None:
         """Add an item to the location"""
+        self._version += 1
         self.items.append(item)
+        self._index_item(item)
 
     def remove_item(self, item_id: str) -> Optional[Item]:
         """Remove and return an item"""
-        for i, item in enumerate(self.items):
-            if item.id == item_id:
-                return self.items.pop(i)
-        return None
+        item = self._items_by_id.pop(item_id, None)
+        if item is None:
+            return None
+        self._version += 1
+        self.items.remove(item)
+        self._unindex(self._items_by_name, item.name.lower(), item)
+        return item
 
     def get_feature_description(self, feature: str) -> Optional[str]:
         """Get detailed description of a specific feature"""
         feature_lower = feature.lower()
-        for f in self.features:
-            if feature_lower in f.lower():
+        if len(self._features_lc) != len(self.features):
+            self._index_features()
+        for f, f_lower in zip(self.features, self._features_lc):
+            if feature_lower in f_lower:
                 # Generate or return a detailed description of the feature
                 return f"You examine the {f}. " + self._generate_feature_description(f)
         return None
@@ -168,12 +274,14 @@ class Location:
 
     def add_exit(self, direction: str, location_id: str) -> None:
         """Add an exit"""
+        self._version += 1
         self.exits[direction.lower()] = location_id
 
     def remove_exit(self, direction: str) -> None:
         """Remove an exit"""
         direction = direction.lower()
         if direction in self.exits:
+            self._version += 1
             del self.exits[direction]
 
     def get_exit(self, direction: str) -> Optional[str]:
@@ -190,15 +298,21 @@ class Location:
 
     def discover_secret(self, secret_id: str) -> bool:
         """Mark a secret as discovered"""
-        if secret_id in self.secrets and not self.secrets[secret_id]['discovered']:
-            self.secrets[secret_id]['discovered'] = True
-            self.secrets[secret_id]['discovery_time'] = datetime.now()
+        secret = self.secrets.get(secret_id)
+        if secret and not secret['discovered']:
+            secret['discovered'] = True
+            secret['discovery_time'] = datetime.now()
             return True
         return False
 
     def set_state(self, key: str, value: bool) -> None:
         """Set a state value"""
         self.state_changes[key] = value
+        self._track_lock(key, value)
+
+    def is_locked(self, direction: str) -> bool:
+        """Whether the exit in a direction is locked or blocked"""
+        return direction in self._locked_exits
 
     def get_state(self) -> Dict:
         """Get complete location state"""
@@ -1,9 +1,16 @@
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
-from entities.items import Item
+import random
+from entities.items import Item, ItemType
 from utils.dice import DiceRoller
 
-@dataclass
+# Item type -> (attributes key it is equipped under, stat its effect_value adds to)
+_EQUIP_SLOTS = {
+    ItemType.WEAPON: ('equipped_weapon', 'attack_power'),
+    ItemType.ARMOR: ('equipped_armor', 'defense'),
+}
+
+@dataclass(slots=True)
 class Player:
     name: str
     hp: int = 50
@@ -16,6 +23,10 @@ class Player:
     current_location_id: Optional[str] = None
     attributes: Dict[str, Any] = field(default_factory=dict)
     status_effects: Dict[str, int] = field(default_factory=dict)  # effect -> duration
+    # Lowercased item name -> first inventory item with that name
+    _inv_by_name: Dict[str, Item] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Item id -> inventory item
+    _inv_by_id: Dict[str, Item] = field(default_factory=dict, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Initialize additional attributes after creation"""
@@ -29,10 +40,14 @@ class Player:
             }
         if not hasattr(self, 'status_effects'):
             self.status_effects = {}
+        for item in self.inventory:
+            self._inv_by_name.setdefault(item.name.lower(), item)
+            self._inv_by_id[item.id] = item
 
     def attack(self) -> int:
         """Perform an attack roll"""
-        base_roll = DiceRoller.roll("1d8").total
+        # A single d8 needs none of DiceRoller's parsing or DiceRoll bookkeeping
+        base_roll = random.randint(1, 8)
         damage = base_roll + self.attack_power
         
         # Critical hit (natural 8)
@@ -72,27 +87,42 @@ class Player:
     def add_item(self, item: Item) -> None:
         """Add item to inventory"""
         self.inventory.append(item)
+        self._inv_by_name.setdefault(item.name.lower(), item)
+        self._inv_by_id[item.id] = item
 
     def remove_item(self, item_id: str) -> Optional[Item]:
         """Remove and return item from inventory"""
-        for i, item in enumerate(self.inventory):
-            if item.id == item_id:
-                return self.inventory.pop(i)
-        return None
+        item = self._inv_by_id.pop(item_id, None)
+        if item is None:
+            return None
+        self.inventory.remove(item)
+        name = item.name.lower()
+        if self._inv_by_name.get(name) is item:
+            # Fall back to another carried item with the same name
+            replacement = next((other for other in self.inventory
+                                if other.name.lower() == name), None)
+            if replacement:
+                self._inv_by_name[name] = replacement
+            else:
+                del self._inv_by_name[name]
+        return item
+
+    def get_item_by_name(self, name: str) -> Optional[Item]:
+        """Get an inventory item by its (case-insensitive) name"""
+        return self._inv_by_name.get(name.lower())
 
     def has_item(self, item_id: str) -> bool:
         """Check if player has specific item"""
-        return any(item.id == item_id for item in self.inventory)
+        return item_id in self._inv_by_id
 
     def get_inventory_description(self) -> str:
         """Get formatted inventory description"""
         if not self.inventory:
             return "Your inventory is empty."
             
-        desc = "Inventory:\n"
-        for item in self.inventory:
-            desc += f"- {item.name}: {item.description}\n"
-        return desc
+        parts = ["Inventory:\n"]
+        parts.extend(f"- {item.name}: {item.description}\n" for item in self.inventory)
+        return "".join(parts)
 
     def add_status_effect(self, effect: str, duration: int) -> None:
         """Add a status effect with duration"""
@@ -105,47 +135,33 @@ class Player:
 
     def update_status_effects(self) -> List[str]:
         """Update status effect durations, return expired effects"""
+        remaining = {}
         expired = []
-        for effect, duration in list(self.status_effects.items()):
-            self.status_effects[effect] = duration - 1
-            if self.status_effects[effect] <= 0:
-                del self.status_effects[effect]
+        for effect, duration in self.status_effects.items():
+            if duration > 1:
+                remaining[effect] = duration - 1
+            else:
                 expired.append(effect)
+        self.status_effects = remaining
         return expired
 
     def equip_item(self, item: Item) -> Dict[str, Any]:
         """Equip an item and return result"""
-        if item.item_type.value == 'weapon':
-            # Check if item is already equipped
-            if self.attributes.get('equipped_weapon') == item:
-                return {'success': False, 'message': f"The {item.name} is already equipped."}
-
-            # Remove old weapon's effect
-            old_weapon = self.attributes.get('equipped_weapon')
-            if old_weapon:
-                self.attack_power -= old_weapon.effect_value
-
-            # Apply new weapon
-            self.attributes['equipped_weapon'] = item
-            self.attack_power += item.effect_value
-            return {'success': True, 'message': f"You equip the {item.name}."}
-        
-        elif item.item_type.value == 'armor':
-            # Check if item is already equipped
-            if self.attributes.get('equipped_armor') == item:
-                return {'success': False, 'message': f"The {item.name} is already equipped."}
-
-            # Remove old armor's effect
-            old_armor = self.attributes.get('equipped_armor')
-            if old_armor:
-                self.defense -= old_armor.effect_value
-
-            # Apply new armor
-            self.attributes['equipped_armor'] = item
-            self.defense += item.effect_value
-            return {'success': True, 'message': f"You equip the {item.name}."}
-            
-        return {'success': False, 'message': f"You can't equip the {item.name}."}
+        slot = _EQUIP_SLOTS.get(item.item_type)
+        if slot is None:
+            return {'success': False, 'message': f"You can't equip the {item.name}."}
+        key, stat = slot
+
+        # Check if item is already equipped
+        current = self.attributes.get(key)
+        if current == item:
+            return {'success': False, 'message': f"The {item.name} is already equipped."}
+
+        # Swap the old item's bonus for the new one's
+        bonus = item.effect_value - (current.effect_value if current else 0)
+        self.attributes[key] = item
+        setattr(self, stat, getattr(self, stat) + bonus)
+        return {'success': True, 'message': f"You equip the {item.name}."}
 
     def get_state(self) -> Dict:
         """Get current player state"""
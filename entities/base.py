@@ -16,6 +16,8 @@ class Entity(ABC):
 
 class GameObject:
     """Base class for game objects with common functionality"""
+    __slots__ = ('id', 'name', 'description')
+
     def __init__(self, id: str, name: str, description: str):
         self.id = id
         self.name = name
@@ -1,5 +1,5 @@
 # items.py
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import uuid
@@ -43,6 +43,8 @@ class Item:
     requirements: Dict[str, Any] = field(default_factory=dict)
     effects: List[ItemEffect] = field(default_factory=list)
     attributes: Dict[str, Any] = field(default_factory=dict)
+    # (uses_remaining, text) of the last examination description
+    _cached_examination: Optional[Tuple[Optional[int], str]] = field(default=None, init=False, repr=False, compare=False)
     
     @staticmethod
     def create_id() -> str:
@@ -60,10 +60,11 @@ class NPC:
     def attack(self) -> tuple[int, bool]:
         """Perform an attack with damage variation"""
         base_damage = self.attack_power
-        variation = random.uniform(0.8, 1.2)  # ±20% damage variation
+        rand = random.random
+        variation = 0.8 + 0.4 * rand()  # ±20% damage variation
         
         # Critical hit chance (10%)
-        if random.random() < 0.1:
+        if rand() < 0.1:
             damage = int(base_damage * 2 * variation)
             return damage, True  # Return damage and crit flag
             
@@ -21,7 +21,7 @@ from config.settings import Settings
 from core.game_world import GameWorld
 from core.player import Player
 from image_system.image_manager import GameImageManager
-from audio_system.audio_manager import AudioManager
+from audio_system.audio_manager import AudioManager, ensure_mixer
 from audio_system.audio_description import AudioDescription
 
 from enum import Enum
@@ -93,6 +93,7 @@ class GameGUI:
 
         # Initialize game components
         self.settings = Settings()
+        self.audio_manager.cache_max_bytes = self.settings.get('audio', 'cache_max_mb') * 1024 * 1024
         self.game_world = GameWorld(audio_manager=self.audio_manager)
         self.player = None
         self.command_queue = queue.Queue()
@@ -550,6 +551,9 @@ Type your character's name and press Enter.
         """Initialize the game world"""
         try:
             # Initial message
+            # Decode sound effects in the background while the world is generated
+            self._effects_preload = asyncio.create_task(self.audio_manager.preload_effects())
+
             init_message = "\nInitializing game world...\n"
             self.write_to_output(init_message)
             await self.audio_manager.speak(init_message.strip(), voice=self.voice_var.get())
@@ -575,6 +579,12 @@ Type your character's name and press Enter.
                     self.write_to_output(location_desc)
                     self.write_to_output("\n" + "═"*80 + "\n")
                     
+                    # Fetch the follow-up line's speech while the description plays
+                    commands_speech = "Here are your available commands: look around, move in a direction, take items, use items, check inventory, or attack targets."
+                    prefetch = asyncio.create_task(
+                        self.audio_manager.prefetch([commands_speech], voice=self.voice_var.get())
+                    )
+                    
                     # Narrate description
                     await self.audio_manager.speak(location_desc, voice=self.voice_var.get())
                     await asyncio.sleep(0.5)  # Brief pause
@@ -583,7 +593,7 @@ Type your character's name and press Enter.
                     cmd_text = "\nAvailable commands: look, move [direction], take [item], use [item], inventory, attack [target]\n"
                     self.write_to_output(cmd_text)
                     
-                    commands_speech = "Here are your available commands: look around, move in a direction, take items, use items, check inventory, or attack targets."
+                    await prefetch
                     await self.audio_manager.speak(commands_speech, voice=self.voice_var.get())
                 
                 except Exception as e:
@@ -780,12 +790,24 @@ Type your character's name and press Enter.
 
     def cleanup(self):
         """Cleanup resources including audio"""
+        if hasattr(self, 'async_tk'):
+            # Cancel background narration and generation while the loop still runs
+            shutdown = asyncio.run_coroutine_threadsafe(self._shutdown_tasks(), self.async_tk.loop)
+            try:
+                shutdown.result(timeout=5)
+            except Exception as e:
+                print(f"Error stopping background tasks: {e}")
         if hasattr(self, 'audio_manager'):
             self.audio_manager.cleanup()
         if hasattr(self, 'async_tk'):
             self.async_tk.stop()
         self.root.destroy()
 
+    async def _shutdown_tasks(self):
+        """Stop the narration workers and the game world's background work"""
+        await self.audio_description.close()
+        await self.game_world.cleanup()
+
     def configure_styles(self):
         """Configure custom styles for the GUI"""
         style = ttk.Style()
@@ -862,7 +884,7 @@ def test_audio():
     """Test basic audio functionality"""
     try:
         # Initialize pygame mixer
-        pygame.mixer.init()
+        ensure_mixer()
         
         # Create a simple beep sound
         duration = 1  # seconds
@@ -9,13 +9,6 @@ class PromptManager:
             'location_description': {
                 'base': '''Create an immersive D&D location description.
 
-Parameters:
-- Location Type: {type}
-- Theme: {theme}
-- Purpose: {purpose}
-- Player Level: {player_level}
-- Current State: {game_state}
-
 Required elements:
 1. Vivid sensory details (sights, sounds, smells)
 2. Notable features and landmarks
@@ -23,8 +16,13 @@ Required elements:
 4. Hints of potential interactions
 5. Clear navigation options
 
-Return the response as a JSON object with these EXACT fields:
-{{
+Parameters:
+- Location Type: {type}
+- Theme: {theme}
+- Purpose: {purpose}
+- Player Level: {player_level}
+- Current State: {game_state}''',
+                'format': '''{
     "name": "Evocative location name",
     "description": "3-4 sentences of rich, sensory description",
     "theme": "Primary thematic element",
@@ -32,122 +30,119 @@ Return the response as a JSON object with these EXACT fields:
     "atmosphere": "One sentence mood/feeling description",
     "exits": ["available directions"],
     "secrets": ["optional hidden elements"]
-}}'''
+}'''
             },
             'location_population': {
                 'base': '''Generate inhabitants and items for a D&D location.
 
-Parameters:
-- Location Theme: {theme}
-- Player Level: {player_level}
-- Location Type: {type}
-
 Create appropriate elements that:
 1. Match the location theme
 2. Suit the player level
 3. Provide interesting interactions
 4. Balance rewards/challenges
 
-Return the response as a JSON object with these EXACT fields:
-{{
+Parameters:
+- Location Theme: {theme}
+- Player Level: {player_level}
+- Location Type: {type}''',
+                'format': '''{
     "items": [
-        {{
+        {
             "name": "Item name",
             "type": "weapon/armor/potion/key/treasure/scroll",
             "description": "Item description",
             "effect_value": 0
-        }}
+        }
     ],
     "npcs": [
-        {{
+        {
             "name": "NPC name",
             "type": "friendly/neutral/hostile",
             "description": "NPC description",
             "behavior": "passive/aggressive/helpful"
-        }}
+        }
     ]
-}}'''
+}'''
             },
             'search_response': {
                 'base': '''Generate detailed search results for a D&D location.
 
-Parameters:
-- Area: {area}
-- Location Details: {location}
-- Player State: {player}
-- Previous Discoveries: {discovered_secrets}
-
 Create engaging discoveries that:
 1. Match the location theme
 2. Reward thorough exploration
 3. Provide meaningful finds
 4. Add to the atmosphere
 
-Return the response as a JSON object with these EXACT fields:
-{{
+Parameters:
+- Area: {area}
+- Location Details: {location}
+- Player State: {player}
+- Previous Discoveries: {discovered_secrets}''',
+                'format': '''{
     "description": "Detailed description of what is found",
     "discoveries": [
-        {{
+        {
             "type": "item/secret/clue",
             "name": "Name of discovery",
             "description": "Detailed description",
             "item_type": "treasure/weapon/potion/etc",
             "effect_value": 0
-        }}
+        }
     ]
-}}'''
+}'''
             },
             'examine_response': {
                 'base': '''Generate examination details for a specific target.
 
-Parameters:
-- Target: {target}
-- Location: {location}
-- Player State: {player}
-- Known Secrets: {discovered_secrets}
-
 Create detailed observations that:
 1. Provide rich details
 2. Reveal interesting aspects
 3. Hint at interactions
 4. Maintain atmosphere
 
-Return the response as a JSON object with these EXACT fields:
-{{
+Parameters:
+- Target: {target}
+- Location: {location}
+- Player State: {player}
+- Known Secrets: {discovered_secrets}''',
+                'format': '''{
     "description": "Detailed examination results",
     "features": ["Notable aspects discovered"],
     "interactions": ["Possible interactions"],
     "secrets": ["Any secrets noticed"]
-}}'''
+}'''
             },
             'action_response': {
                 'base': '''Generate a response to a player's action.
 
-Parameters:
-- Action: {command}
-- Location: {location}
-- Player State: {player}
-- Game State: {game_state}
-
 Create a response that:
 1. Describes the outcome clearly
 2. Maintains game atmosphere
 3. Provides clear feedback
 4. Suggests further possibilities
 
-Return the response as a JSON object with these EXACT fields:
-{{
+Parameters:
+- Action: {command}
+- Location: {location}
+- Player State: {player}
+- Game State: {game_state}''',
+                'format': '''{
     "description": "What happens as a result",
     "success": true,
-    "effect": {{
-        "player": {{"hp_change": 0, "status_effect": null}},
-        "location": {{"state_changes": {{}}}}
-    }},
+    "effect": {
+        "player": {"hp_change": 0, "status_effect": null},
+        "location": {"state_changes": {}}
+    },
     "next_situation": "exploration/combat/dialog"
-}}'''
+}'''
             }
         }
 
+        # The system prompt carries every response format so that all requests
+        # share one long, identical prefix that OpenAI can serve from its prompt
+        # cache; only the per-request parameters come after it.
+        self._system_prompt = self._build_system_prompt()
+
     def format_prompt(self, prompt_type: str, parameters: Dict[str, Any]) -> str:
         """Format a prompt template with parameters"""
         if prompt_type not in self.templates:
@@ -157,7 +152,10 @@ Return the response as a JSON object with these EXACT fields:
         try:
             template = self.templates[prompt_type]['base']
             formatted_params = self._prepare_parameters(prompt_type, parameters)
-            return template.format(**formatted_params)
+            return (
+                template.format(**formatted_params) +
+                f"\n\nReturn the response as a JSON object with the EXACT fields of the {prompt_type} format."
+            )
             
         except Exception as e:
             logging.error(f"Error formatting prompt: {e}")
@@ -196,7 +194,15 @@ Return the response as a JSON object with these EXACT fields:
 
     def get_system_prompt(self) -> str:
         """Get the system prompt for AI context"""
-        return """You are an expert D&D Dungeon Master AI assistant.
+        return self._system_prompt
+
+    def _build_system_prompt(self) -> str:
+        """Build the static system prompt including all response formats"""
+        formats = "\n\n".join(
+            f"{prompt_type} format:\n{template['format']}"
+            for prompt_type, template in self.templates.items()
+        )
+        return f"""You are an expert D&D Dungeon Master AI assistant.
 
 Key responsibilities:
 1. Create rich, atmospheric descriptions
@@ -205,7 +211,11 @@ Key responsibilities:
 4. Maintain narrative consistency
 5. Balance challenge and reward
 
-IMPORTANT: You must ALWAYS return responses as properly formatted JSON objects exactly matching the specified format for each prompt type. Double-check your JSON structure before responding."""
+IMPORTANT: You must ALWAYS return responses as properly formatted JSON objects exactly matching the specified format for each prompt type. Double-check your JSON structure before responding.
+
+Response formats:
+
+{formats}"""
 
     def _get_fallback_template(self) -> str:
         """Get fallback template for errors"""
@@ -1,5 +1,6 @@
 # utils/dice.py
 from typing import List, Tuple, Optional
+import functools
 import random
 from dataclasses import dataclass
 
@@ -13,32 +14,48 @@ class DiceRoll:
     is_critical: bool = False
     is_fumble: bool = False
 
+@functools.lru_cache(maxsize=64)
+def _parse_dice(dice_str: str) -> Tuple[int, int, int]:
+    """Split a dice string into (count, sides, modifier)"""
+    modifier = 0
+    if '+' in dice_str:
+        dice_part, mod = dice_str.split('+')
+        modifier = int(mod)
+    elif '-' in dice_str:
+        dice_part, mod = dice_str.split('-')
+        modifier = -int(mod)
+    else:
+        dice_part = dice_str
+
+    # Parse dice count and type
+    if 'd' in dice_part:
+        count, sides = dice_part.split('d')
+        count = int(count) if count else 1
+        sides = int(sides)
+    else:
+        raise ValueError("Invalid dice format")
+    return count, sides, modifier
+
 class DiceRoller:
+    # Minimum d20 total needed at each difficulty
+    SKILL_THRESHOLDS = {
+        "very_easy": 5,
+        "easy": 10,
+        "normal": 15,
+        "hard": 20,
+        "very_hard": 25
+    }
+
     @staticmethod
     def roll(dice_str: str) -> DiceRoll:
         """Roll dice (e.g., "1d6+2", "2d8-1")"""
         try:
-            # Parse the dice string
-            modifier = 0
-            if '+' in dice_str:
-                dice_part, mod = dice_str.split('+')
-                modifier = int(mod)
-            elif '-' in dice_str:
-                dice_part, mod = dice_str.split('-')
-                modifier = -int(mod)
-            else:
-                dice_part = dice_str
-
-            # Parse dice count and type
-            if 'd' in dice_part:
-                count, sides = dice_part.split('d')
-                count = int(count) if count else 1
-                sides = int(sides)
-            else:
-                raise ValueError("Invalid dice format")
+            # Combat rolls the same few dice strings every turn, so parsing is cached
+            count, sides, modifier = _parse_dice(dice_str)
 
             # Roll the dice
-            results = [random.randint(1, sides) for _ in range(count)]
+            randint = random.randint
+            results = [randint(1, sides) for _ in range(count)]
             total = sum(results) + modifier
 
             # Check for critical roll (all max values) or fumble (all 1s)
@@ -70,16 +87,7 @@ class DiceRoller:
         """Perform a skill check with different difficulty levels"""
         roll = DiceRoller.roll("1d20")
         
-        # Difficulty thresholds
-        thresholds = {
-            "very_easy": 5,
-            "easy": 10,
-            "normal": 15,
-            "hard": 20,
-            "very_hard": 25
-        }
-        
-        threshold = thresholds.get(difficulty, 15)
+        threshold = DiceRoller.SKILL_THRESHOLDS.get(difficulty, 15)
         success = roll.total >= threshold
         
         # Critical success/failure override normal results
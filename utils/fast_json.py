@@ -0,0 +1,43 @@
+# utils/fast_json.py
+"""JSON helpers that use orjson when it is installed, falling back to the stdlib"""
+from typing import Any, Union
+import functools
+import json
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    JSONDecodeError = orjson.JSONDecodeError
+
+    def loads(data: Union[str, bytes]) -> Any:
+        """Parse JSON from str or bytes"""
+        return orjson.loads(data)
+
+    def dumps(obj: Any, indent: bool = False) -> bytes:
+        """Serialize to UTF-8 JSON bytes, optionally indented by two spaces"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+else:
+    JSONDecodeError = json.JSONDecodeError
+
+    def loads(data: Union[str, bytes]) -> Any:
+        """Parse JSON from str or bytes"""
+        return json.loads(data)
+
+    def dumps(obj: Any, indent: bool = False) -> bytes:
+        """Serialize to UTF-8 JSON bytes, optionally indented by two spaces"""
+        return json.dumps(obj, indent=2 if indent else None).encode()
+
+@functools.lru_cache(maxsize=32)
+def _parse_file(path: str, mtime_ns: int) -> Any:
+    return loads(Path(path).read_bytes())
+
+def load_file(path: Path) -> Any:
+    """Parse a JSON file, reusing the previous result while the file is unchanged.
+
+    The returned object is shared between callers and must not be mutated.
+    """
+    return _parse_file(str(path), path.stat().st_mtime_ns)
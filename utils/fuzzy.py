@@ -0,0 +1,77 @@
+# utils/fuzzy.py
+"""Subsequence scoring for matching what the player typed against names"""
+from typing import Optional, Sequence
+
+SCORE_MATCH = 16
+BONUS_BOUNDARY = 8
+BONUS_CONSECUTIVE = 4
+PENALTY_GAP_START = 3
+PENALTY_GAP_EXTENSION = 1
+
+# Shorter patterns match too many names by accident
+MIN_PATTERN_LENGTH = 3
+
+# A match right after one of these starts a word
+_BOUNDARY_CHARS = frozenset(" /._-'")
+
+def _is_word_start(candidate: str, position: int) -> bool:
+    return position == 0 or candidate[position - 1] in _BOUNDARY_CHARS
+
+def _find_word_start(candidate: str, char: str, start: int) -> int:
+    """Index of the first word in candidate at or after start beginning with char, or -1"""
+    position = candidate.find(char, start)
+    while position > 0 and not _is_word_start(candidate, position):
+        position = candidate.find(char, position + 1)
+    return position
+
+def fuzzy_score(pattern: str, candidate: str) -> Optional[int]:
+    """Score a lowercased pattern as a subsequence of a lowercased candidate.
+
+    Each word of the pattern must match in order, starting at the beginning
+    of a word in the candidate. Returns None when the pattern does not match.
+    """
+    words = pattern.split()
+    if not words:
+        return None
+
+    score = 0
+    previous = -2
+    position = -1
+    for word in words:
+        # A word's first letter anchors it, so 'east' never matches inside 'stream'
+        position = _find_word_start(candidate, word[0], position + 1)
+        if position < 0:
+            return None
+        for index, char in enumerate(word):
+            if index:
+                position = candidate.find(char, position + 1)
+                if position < 0:
+                    return None
+            score += SCORE_MATCH
+            if _is_word_start(candidate, position):
+                score += BONUS_BOUNDARY
+            if position == previous + 1:
+                score += BONUS_CONSECUTIVE
+            elif previous >= 0:
+                score -= PENALTY_GAP_START + PENALTY_GAP_EXTENSION * (position - previous - 2)
+            previous = position
+    return score
+
+def best_match(pattern: str, candidates: Sequence[str]) -> Optional[int]:
+    """Index of the best-scoring candidate, or None if none scores well enough.
+
+    A match must score at least a plain character match per pattern
+    character plus the word-start bonus per pattern word, so gaps have to be
+    paid for by consecutive runs rather than by the anchoring bonuses.
+    """
+    words = pattern.split()
+    length = sum(len(word) for word in words)
+    if length < MIN_PATTERN_LENGTH:
+        return None
+    threshold = SCORE_MATCH * length + BONUS_BOUNDARY * len(words)
+    best, best_score = None, threshold - 1
+    for index, candidate in enumerate(candidates):
+        score = fuzzy_score(pattern, candidate)
+        if score is not None and score > best_score:
+            best, best_score = index, score
+    return best